@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'inventory.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -135,11 +136,52 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'EXCEPTION_HANDLER': 'inventory.exceptions.custom_exception_handler'
+    'EXCEPTION_HANDLER': 'inventory.exceptions.custom_exception_handler',
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'inventory.renderers.MessagePackRenderer',
+        'inventory.renderers.ColumnarJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'inventory.parsers.MessagePackParser',
+        'inventory.parsers.ColumnarJSONParser',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'inventory.throttling.EndpointClassRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'read': os.environ.get('THROTTLE_RATE_READ', '1000/min'),
+        'list': os.environ.get('THROTTLE_RATE_LIST', '300/min'),
+        'write': os.environ.get('THROTTLE_RATE_WRITE', '120/min'),
+        'pricing': os.environ.get('THROTTLE_RATE_PRICING', '30/min'),
+    },
+    # Cantidad de proxies de confianza delante de la API; con 0 se ignora X-Forwarded-For.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+}
+
+# Almacén compartido para los contadores de throttling (memoria local por defecto).
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
 }
 
+# Compresión de respuestas (gzip / brotli)
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+
 EXCHANGE_RATE_API_URL = os.environ.get('EXCHANGE_RATE_API_URL')
 
+EXCHANGE_RATE_MAX_CONCURRENCY = int(os.environ.get('EXCHANGE_RATE_MAX_CONCURRENCY', 4))
+
+EXCHANGE_RATE_RETRY_AFTER = int(os.environ.get('EXCHANGE_RATE_RETRY_AFTER', 5))
+
 LOCAL_CURRENCY = os.environ.get('LOCAL_CURRENCY', 'USD')
 
 PROFIT_MARGIN = Decimal(os.environ.get('PROFIT_MARGIN', '0.40'))
\ No newline at end of file
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def parse_accept_encoding(header):
+    """
+    Devuelve un diccionario {codificación: calidad} a partir de la cabecera Accept-Encoding.
+    """
+    encodings = {}
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[token] = quality
+    return encodings
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Comprime las respuestas mayores a COMPRESSION_MIN_SIZE bytes con brotli o gzip,
+    según lo que el cliente acepte en Accept-Encoding. gzip se delega en GZipMiddleware de Django,
+    que agrega relleno aleatorio contra BREACH. Brotli solo se usa si el paquete está instalado
+    y nunca para respuestas text/html, que pueden contener tokens CSRF.
+    """
+
+    def get_encoding(self, request, response):
+        accepted = parse_accept_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+        candidates = []
+        if brotli is not None and not response.streaming and not self.is_html(response):
+            candidates.append('br')
+        candidates.append('gzip')
+
+        best, best_quality = None, 0.0
+        for encoding in candidates:
+            quality = accepted.get(encoding, 0.0)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def is_html(self, response):
+        return response.get('Content-Type', '').split(';')[0].strip().lower() == 'text/html'
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+
+        # Aunque no se comprima, la respuesta depende de Accept-Encoding para las cachés intermedias.
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        encoding = self.get_encoding(request, response)
+        if encoding == 'gzip':
+            return super().process_response(request, response)
+        if encoding == 'br':
+            return self.compress_brotli(response)
+        return response
+
+    def compress_brotli(self, response):
+        compressed_content = brotli.compress(response.content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        if len(compressed_content) >= len(response.content):
+            return response
+
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+        response.headers['Content-Encoding'] = 'br'
+
+        # El contenido cambió, por lo que un ETag fuerte deja de ser válido.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+        return response
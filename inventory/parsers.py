@@ -0,0 +1,48 @@
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parser para cuerpos de petición codificados en MessagePack.
+    """
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
+
+
+class ColumnarJSONParser(JSONParser):
+    """
+    Parser para el formato JSON orientado a columnas ({"fields": [...], "rows": [[...]]}).
+    Como la API no tiene endpoints de escritura masiva, el cuerpo debe contener exactamente una fila,
+    que se devuelve como un objeto.
+    """
+    media_type = 'application/vnd.bookstore.columnar+json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        data = super().parse(stream, media_type, parser_context)
+
+        if not isinstance(data, dict) or 'fields' not in data or 'rows' not in data:
+            raise ParseError("El cuerpo columnar debe contener las claves 'fields' y 'rows'.")
+
+        fields = data['fields']
+        rows = data['rows']
+        if not isinstance(fields, list) or not isinstance(rows, list):
+            raise ParseError("'fields' y 'rows' deben ser listas.")
+
+        if not all(isinstance(field, str) for field in fields):
+            raise ParseError("Cada elemento de 'fields' debe ser un texto.")
+
+        if len(rows) != 1:
+            raise ParseError("El cuerpo columnar debe contener exactamente una fila en 'rows'.")
+
+        row = rows[0]
+        if not isinstance(row, list) or len(row) != len(fields):
+            raise ParseError("La fila debe ser una lista con un valor por cada campo en 'fields'.")
+
+        return dict(zip(fields, row))
@@ -0,0 +1,45 @@
+import msgpack
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+def encode_msgpack_default(obj):
+    """
+    Convierte los tipos que MessagePack no soporta de forma nativa (Decimal, datetime, etc.)
+    reutilizando las mismas reglas que el JSONEncoder de DRF.
+    """
+    return JSONEncoder().default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer que serializa la respuesta en formato binario MessagePack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_msgpack_default, use_bin_type=True)
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Renderer JSON orientado a columnas: los listados se envían como
+    {"fields": [...], "rows": [[...], ...]}, de modo que cada nombre de campo
+    viaja una sola vez. Las respuestas que no son listas de objetos se renderizan como JSON normal.
+    """
+    media_type = 'application/vnd.bookstore.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+            fields = list(data[0].keys()) if data else []
+            data = {
+                'fields': fields,
+                'rows': [[item.get(field) for field in fields] for item in data],
+            }
+        return super().render(data, accepted_media_type, renderer_context)
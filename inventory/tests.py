@@ -1,10 +1,18 @@
+import gzip
+import json
+import threading
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from .models import Book
+from .throttling import EndpointClassRateThrottle
 from decimal import Decimal
 from unittest.mock import patch
 import requests
+import msgpack
+import brotli
 
 class BookViewSetTestCase(APITestCase):
     """
@@ -216,4 +224,285 @@ class BookViewSetTestCase(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         expected_error = f"La moneda '{unsupported_currency}' no es soportada por el servicio de cambio."
-        self.assertEqual(response.data['error'], expected_error)
\ No newline at end of file
+        self.assertEqual(response.data['error'], expected_error)
+
+class ResponseEncodingTestCase(APITestCase):
+    """
+    Tests para los renderers, parsers y la compresión de respuestas.
+    """
+    def setUp(self):
+        """
+        Configura datos de prueba.
+        """
+        self.book = Book.objects.create(
+            title="Foundation",
+            author="Isaac Asimov",
+            isbn="978-0553803716",
+            cost_usd=Decimal("12.00"),
+            stock_quantity=20,
+            category="Sci-Fi",
+            supplier_country="US"
+        )
+        self.new_book = {
+            "title": "Dune",
+            "author": "Frank Herbert",
+            "isbn": "978-0441013593",
+            "cost_usd": "25.00",
+            "stock_quantity": 15,
+            "category": "Sci-Fi",
+            "supplier_country": "US"
+        }
+
+    def test_list_books_msgpack(self):
+        """
+        Prueba que el listado se pueda obtener en MessagePack.
+        """
+        url = reverse('book-list')
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(data[0]['isbn'], self.book.isbn)
+
+    def test_list_books_columnar(self):
+        """
+        Prueba que el listado columnar envíe cada nombre de campo una sola vez.
+        """
+        url = reverse('book-list')
+        response = self.client.get(url, HTTP_ACCEPT='application/vnd.bookstore.columnar+json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertIn('isbn', data['fields'])
+        self.assertEqual(len(data['rows']), 1)
+        self.assertEqual(data['rows'][0][data['fields'].index('isbn')], self.book.isbn)
+
+    def test_create_book_msgpack(self):
+        """
+        Prueba la creación de un libro enviando el cuerpo en MessagePack.
+        """
+        url = reverse('book-list')
+        response = self.client.generic(
+            'POST', url, msgpack.packb(self.new_book), content_type='application/msgpack'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Book.objects.get(isbn=self.new_book['isbn']).title, "Dune")
+
+    def test_create_book_columnar(self):
+        """
+        Prueba la creación de un libro enviando el cuerpo en formato columnar.
+        """
+        url = reverse('book-list')
+        body = {
+            'fields': list(self.new_book.keys()),
+            'rows': [list(self.new_book.values())],
+        }
+        response = self.client.generic(
+            'POST', url, json.dumps(body), content_type='application/vnd.bookstore.columnar+json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Book.objects.get(isbn=self.new_book['isbn']).title, "Dune")
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_list_books_gzip(self):
+        """
+        Prueba que la respuesta se comprima con gzip cuando el cliente lo acepta.
+        """
+        # El relleno aleatorio de gzip puede hacer que respuestas muy cortas no se compriman.
+        Book.objects.bulk_create([
+            Book(
+                title=f"Book {i}",
+                author="Author",
+                isbn=f"978-00000000{i:02d}",
+                cost_usd=Decimal("10.00"),
+                stock_quantity=i,
+                category="Sci-Fi",
+                supplier_country="US"
+            )
+            for i in range(20)
+        ])
+        url = reverse('book-list')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(data[0]['isbn'], self.book.isbn)
+
+    def test_create_book_malformed_msgpack(self):
+        """
+        Prueba que un cuerpo MessagePack inválido responda 400.
+        """
+        url = reverse('book-list')
+        response = self.client.generic('POST', url, b'\xc1', content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_book_columnar_mismatched_row(self):
+        """
+        Prueba que una fila con distinta cantidad de valores que 'fields' responda 400.
+        """
+        url = reverse('book-list')
+        body = {'fields': ['title', 'author'], 'rows': [['Dune']]}
+        response = self.client.generic(
+            'POST', url, json.dumps(body), content_type='application/vnd.bookstore.columnar+json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_book_columnar_invalid_fields(self):
+        """
+        Prueba que nombres de campo que no son texto respondan 400.
+        """
+        url = reverse('book-list')
+        body = {'fields': [[1]], 'rows': [[1]]}
+        response = self.client.generic(
+            'POST', url, json.dumps(body), content_type='application/vnd.bookstore.columnar+json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_book_columnar_multiple_rows(self):
+        """
+        Prueba que un cuerpo columnar con más de una fila responda 400.
+        """
+        url = reverse('book-list')
+        body = {
+            'fields': list(self.new_book.keys()),
+            'rows': [list(self.new_book.values()), list(self.new_book.values())],
+        }
+        response = self.client.generic(
+            'POST', url, json.dumps(body), content_type='application/vnd.bookstore.columnar+json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Book.objects.count(), 1)
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_list_books_brotli(self):
+        """
+        Prueba que la respuesta se comprima con brotli cuando el cliente lo prefiere.
+        """
+        url = reverse('book-list')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='br, gzip;q=0.5')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        data = json.loads(brotli.decompress(response.content))
+        self.assertEqual(data[0]['isbn'], self.book.isbn)
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_gzip_quality_zero_not_compressed(self):
+        """
+        Prueba que 'gzip;q=0' no produzca una respuesta comprimida.
+        """
+        url = reverse('book-list')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_html_response_not_brotli(self):
+        """
+        Prueba que las respuestas HTML no se compriman con brotli.
+        """
+        url = reverse('book-list')
+        response = self.client.get(url, HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_small_response_not_compressed(self):
+        """
+        Prueba que las respuestas por debajo del umbral no se compriman.
+        """
+        url = reverse('book-detail', kwargs={'pk': self.book.pk})
+        with override_settings(COMPRESSION_MIN_SIZE=10 ** 6):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class AdmissionControlTestCase(APITestCase):
+    """
+    Tests para el throttling por clase de endpoint y el límite de concurrencia de la API de cambio.
+    """
+    def setUp(self):
+        """
+        Configura datos de prueba y limpia los contadores compartidos.
+        """
+        cache.clear()
+        self.book = Book.objects.create(
+            title="Foundation",
+            author="Isaac Asimov",
+            isbn="978-0553803716",
+            cost_usd=Decimal("12.00"),
+            stock_quantity=20,
+            category="Sci-Fi",
+            supplier_country="US"
+        )
+
+    @patch('inventory.views.requests.get')
+    def test_pricing_throttle_does_not_block_reads(self, mock_get):
+        """
+        Prueba que al superar el límite de 'pricing' se responda 429 sin afectar las lecturas.
+        """
+        mock_get.return_value.json.return_value = {"rates": {"USD": "1.0"}}
+        url = reverse('book-calculate-price', kwargs={'pk': self.book.pk})
+
+        with patch.dict(EndpointClassRateThrottle.THROTTLE_RATES, {'pricing': '1/min'}), \
+            patch('django.conf.settings.LOCAL_CURRENCY', 'USD'):
+            first = self.client.post(url)
+            second = self.client.post(url)
+            read = self.client.get(reverse('book-detail', kwargs={'pk': self.book.pk}))
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', second)
+        self.assertEqual(read.status_code, status.HTTP_200_OK)
+
+    def test_list_throttle_does_not_block_detail_reads(self):
+        """
+        Prueba que los listados tengan un límite propio, separado de las lecturas de detalle.
+        """
+        with patch.dict(EndpointClassRateThrottle.THROTTLE_RATES, {'list': '1/min'}):
+            first = self.client.get(reverse('book-list'))
+            second = self.client.get(reverse('book-list'))
+            detail = self.client.get(reverse('book-detail', kwargs={'pk': self.book.pk}))
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+
+    def test_throttle_ignores_forwarded_for(self):
+        """
+        Prueba que cambiar X-Forwarded-For no permita evadir el límite por cliente.
+        """
+        url = reverse('book-detail', kwargs={'pk': self.book.pk})
+        with patch.dict(EndpointClassRateThrottle.THROTTLE_RATES, {'read': '2/min'}):
+            responses = [
+                self.client.get(url, HTTP_X_FORWARDED_FOR=f'10.0.0.{i}') for i in range(3)
+            ]
+
+        self.assertEqual(responses[1].status_code, status.HTTP_200_OK)
+        self.assertEqual(responses[2].status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @patch('inventory.views.requests.get')
+    def test_calculate_price_concurrency_limit(self, mock_get):
+        """
+        Prueba que se responda 503 con Retry-After cuando no hay cupos para llamar a la API de cambio.
+        """
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        url = reverse('book-calculate-price', kwargs={'pk': self.book.pk})
+
+        with patch('inventory.views.exchange_rate_slots', slots):
+            response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
+        mock_get.assert_not_called()
+
+    def test_throttle_metrics(self):
+        """
+        Prueba que el endpoint de métricas reporte las peticiones rechazadas.
+        """
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        url = reverse('book-calculate-price', kwargs={'pk': self.book.pk})
+
+        with patch('inventory.views.exchange_rate_slots', slots):
+            self.client.post(url)
+
+        response = self.client.get(reverse('throttle-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rejected_requests']['exchange_rate_concurrency'], 1)
+        self.assertEqual(response.data['rejected_requests']['pricing'], 0)
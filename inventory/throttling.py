@@ -0,0 +1,74 @@
+import logging
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+REJECTION_KEY_PREFIX = 'throttle_rejected'
+
+
+def record_rejection(scope):
+    """
+    Incrementa el contador de peticiones rechazadas para un scope en el almacén compartido (cache).
+    """
+    key = f'{REJECTION_KEY_PREFIX}_{scope}'
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # La clave pudo haber expirado o sido eliminada entre add() e incr().
+        cache.set(key, 1, timeout=None)
+    logger.debug(f"Petición rechazada por control de admisión (scope '{scope}').")
+
+
+def get_rejection_counts(scopes):
+    """
+    Devuelve un diccionario {scope: cantidad de rechazos} para los scopes indicados.
+    """
+    keys = {f'{REJECTION_KEY_PREFIX}_{scope}': scope for scope in scopes}
+    counts = cache.get_many(list(keys))
+    return {scope: counts.get(key, 0) for key, scope in keys.items()}
+
+
+class EndpointClassRateThrottle(SimpleRateThrottle):
+    """
+    Limita las peticiones por cliente según la clase de endpoint:
+    'pricing' para el cálculo de precios, 'list' para los listados, 'write' para métodos de escritura
+    y 'read' para el resto.
+    Los contadores se guardan en la cache por defecto de Django, configurable mediante CACHES.
+    """
+    pricing_actions = ('calculate_price',)
+
+    def __init__(self):
+        # El scope y la tasa se determinan en allow_request(), cuando la vista ya es conocida.
+        pass
+
+    def get_endpoint_class(self, request, view):
+        if getattr(view, 'action', None) in self.pricing_actions:
+            return 'pricing'
+        if getattr(view, 'action', None) == 'list':
+            return 'list'
+        if request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return 'read'
+        return 'write'
+
+    def allow_request(self, request, view):
+        self.scope = self.get_endpoint_class(request, view)
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': ident
+        }
+
+    def throttle_failure(self):
+        record_rejection(self.scope)
+        return super().throttle_failure()
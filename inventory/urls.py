@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BookViewSet
+from .views import BookViewSet, ThrottleMetricsView
 
 # Create a router and register our viewset with it.
 router = DefaultRouter()
@@ -9,4 +9,5 @@ router.register(r'books', BookViewSet, basename='book')
 # The API URLs are now determined automatically by the router.
 urlpatterns = [
     path('', include(router.urls)),
+    path('metrics/throttling/', ThrottleMetricsView.as_view(), name='throttle-metrics'),
 ]
\ No newline at end of file
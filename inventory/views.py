@@ -1,16 +1,26 @@
 import requests
 import logging
+import threading
 from decimal import Decimal
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
 from .models import Book
 from .serializers import BookSerializer
+from .throttling import get_rejection_counts, record_rejection
 from django.conf import settings
 from rest_framework.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Limita las llamadas simultáneas a la API de cambio para que no ocupen todos los workers.
+exchange_rate_slots = threading.BoundedSemaphore(settings.EXCHANGE_RATE_MAX_CONCURRENCY)
+
+EXCHANGE_RATE_CONCURRENCY_SCOPE = 'exchange_rate_concurrency'
+
 class BookViewSet(viewsets.ModelViewSet):
     """
     API endpoint que permite ver y editar libros.
@@ -45,7 +55,15 @@ class BookViewSet(viewsets.ModelViewSet):
         Calcula y actualiza el precio de venta en moneda local basado en el costo en USD.
         """
         book = self.get_object()
-        
+
+        if not exchange_rate_slots.acquire(blocking=False):
+            record_rejection(EXCHANGE_RATE_CONCURRENCY_SCOPE)
+            return Response(
+                {"error": "El servicio de tasas de cambio está saturado. Intente nuevamente más tarde."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(settings.EXCHANGE_RATE_RETRY_AFTER)}
+            )
+
         try:
             # USA LA CONFIGURACIÓN DE SETTINGS
             response = requests.get(settings.EXCHANGE_RATE_API_URL, timeout=5)
@@ -70,6 +88,8 @@ class BookViewSet(viewsets.ModelViewSet):
                 {"error": "El servicio de tasas de cambio no está disponible en este momento."},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
+        finally:
+            exchange_rate_slots.release()
 
         cost_local = book.cost_usd * exchange_rate
         # USA LA CONFIGURACIÓN DE SETTINGS
@@ -91,4 +111,16 @@ class BookViewSet(viewsets.ModelViewSet):
             'calculation_timestamp': book.updated_at
         }
         
-        return Response(response_data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class ThrottleMetricsView(APIView):
+    """
+    API endpoint que expone la cantidad de peticiones rechazadas por el control de admisión.
+    """
+    throttle_classes = []
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        scopes = list(settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']) + [EXCHANGE_RATE_CONCURRENCY_SCOPE]
+        return Response({'rejected_requests': get_rejection_counts(scopes)}, status=status.HTTP_200_OK)
\ No newline at end of file